@@ -1,8 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from pathlib import Path
+from typing import List
+import os
+import sys
 
-from mutagen.easyid3 import EasyID3
+from mutagen.id3 import ID3, ID3NoHeaderError
 
-mp3 = Path("./AMEE; Hoàng Dũng - nàng thơ… trời giấu trời mang đi.mp3")
-tags = EasyID3(mp3)
-artists = tags.get("artist", [])
-print("Raw artist list from ID3:", artists)
+# Most tags fit in the first read; larger ones (cover art) take one more pread.
+HEADER_READ_SIZE = 4096
+SCAN_WORKERS = 64
+
+
+def _sniff_id3_header(path: Path) -> bytes:
+    """Return the ID3v2 tag bytes from the start of the file."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.pread(fd, HEADER_READ_SIZE, 0)
+        if len(data) < 10 or not data.startswith(b"ID3"):
+            return data
+        # Tag size is a 28-bit synchsafe int; add the header and optional footer.
+        size = 0
+        for byte in data[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        size += 10
+        if data[5] & 0x10:
+            size += 10
+        if size > len(data):
+            data += os.pread(fd, size - len(data), len(data))
+        return data[:size]
+    finally:
+        os.close(fd)
+
+
+def _read_artists(path: Path) -> List[str]:
+    """Return every TPE1 text value, one list item per stored entry."""
+    try:
+        tags = ID3(BytesIO(_sniff_id3_header(path)), load_v1=False)
+    except ID3NoHeaderError as exc:
+        raise ValueError("no ID3v2 tag") from exc
+    return [text for frame in tags.getall("TPE1") for text in frame.text]
+
+
+paths = [Path(p) for p in sys.argv[1:]] or [
+    Path("./AMEE; Hoàng Dũng - nàng thơ… trời giấu trời mang đi.mp3")
+]
+with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+    futures = [(mp3, pool.submit(_read_artists, mp3)) for mp3 in paths]
+    for mp3, future in futures:
+        try:
+            print(f"{mp3}: raw artist list from ID3:", future.result())
+        except Exception as exc:  # noqa: BLE001
+            print(f"{mp3}: could not read ID3 ({exc})")
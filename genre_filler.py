@@ -3,17 +3,47 @@ GUI tool to batch-fill the Genre tag on MP3 files.
 """
 from __future__ import annotations
 
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 import json
+import os
+import queue
+import re
+import sqlite3
+import stat
+import sys
+import threading
 
 import PySimpleGUI as sg
-import mutagen
-from mutagen.easyid3 import EasyID3
-from mutagen.id3 import ID3NoHeaderError, TXXX
+from mutagen import MutagenError, PaddingInfo
+from mutagen.id3 import ID3, ID3NoHeaderError, TCON, TPE1, TXXX
+from mutagen.mp3 import MP3
 
 
 RECENT_PATH = Path(__file__).with_name(".recent_dirs.json")
+RECENT_LIMIT = 2
+CACHE_PATH = Path(__file__).with_name(".genre_cache.sqlite")
+# Only fan the directory walk out to threads when a root has more subfolders
+# than this; small trees are faster to walk on a single thread.
+PARALLEL_WALK_MIN_SUBDIRS = 4
+# Tag saves are I/O bound, so a handful of threads overlaps the file writes.
+TAG_WORKERS = 8
+# Cap on files queued for tagging, so a huge walk does not hold a Future
+# per file and results are reported while discovery is still running.
+MAX_IN_FLIGHT = TAG_WORKERS * 4
+
+# Recent-dir writes go through a single background writer and are skipped
+# when the list has not changed since the last save.
+_last_saved_recent_json: Optional[str] = None
+_recent_writes: "queue.Queue[Tuple[Path, str]]" = queue.Queue()
+_recent_writer: Optional[threading.Thread] = None
+
+_MP3_SUFFIXES = (".mp3", ".MP3", ".Mp3", ".mP3")
+_DROP_SPLIT = re.compile(r"[;\r\n]+")
+_ARTIST_SPLIT = re.compile(r"[;,/]")
 
 
 def _log_line(window: sg.Window, message: str) -> None:
@@ -22,6 +52,19 @@ def _log_line(window: sg.Window, message: str) -> None:
     log.print(message)
 
 
+def _add_targets(selected: Dict[Path, None], selected_display: List[str], paths: Iterable[Path]) -> None:
+    """Add new paths to the selection, keeping the display strings in step."""
+    for path in paths:
+        if path not in selected:
+            selected[path] = None
+            selected_display.append(str(path))
+
+
+def _refresh_targets(window: sg.Window, selected_display: List[str]) -> None:
+    """Show the current selection in the targets listbox."""
+    window["-TARGETS-"].update(values=selected_display)
+
+
 def _normalize_entries(entries: Sequence[str]) -> List[Path]:
     """Convert user-provided paths into Path objects, skipping empties."""
     cleaned: List[Path] = []
@@ -32,42 +75,179 @@ def _normalize_entries(entries: Sequence[str]) -> List[Path]:
     return cleaned
 
 
-def _collect_mp3s(items: Iterable[Path]) -> Tuple[List[Path], List[str]]:
-    """Return MP3 files discovered under the given paths plus any errors."""
-    mp3s: List[Path] = []
+def _walk_mp3s_parallel(roots: Sequence[Path], cancel: threading.Event) -> Iterator[str]:
+    """Walk directories with a pool of threads, yielding MP3 paths as found."""
+    max_workers = (os.cpu_count() or 1) * 2
+    pending: "queue.Queue[str | None]" = queue.Queue()
+    # Bounded so the walk cannot run far ahead of a tagger that is busy.
+    found: "queue.Queue[List[str] | None]" = queue.Queue(maxsize=max_workers * 4)
+    # Set when the consumer stops early; workers then drain the queue unscanned.
+    stop = threading.Event()
+
+    def offer(batch: List[str] | None, give_up: Sequence[threading.Event]) -> None:
+        # A plain blocking put could hang forever once nobody reads `found`.
+        while not any(event.is_set() for event in give_up):
+            try:
+                found.put(batch, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def worker() -> None:
+        while True:
+            directory = pending.get()
+            if directory is None:
+                break
+            local: List[str] = []
+            try:
+                if stop.is_set() or cancel.is_set():
+                    continue
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.put(entry.path)
+                            elif entry.name.endswith(_MP3_SUFFIXES) and entry.is_file():
+                                local.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+            finally:
+                if local:
+                    offer(local, (stop, cancel))
+                pending.task_done()
+
+    def finish() -> None:
+        # Once every queued directory is processed, wake the workers to exit.
+        pending.join()
+        for _ in range(max_workers):
+            pending.put(None)
+        # The end marker must still reach a reader after a cancel.
+        offer(None, (stop,))
+
+    for root in roots:
+        pending.put(str(root))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for _ in range(max_workers):
+            pool.submit(worker)
+        threading.Thread(target=finish, daemon=True).start()
+        try:
+            while True:
+                batch = found.get()
+                if batch is None:
+                    break
+                yield from batch
+        finally:
+            # Let the pool shut down without finishing the walk.
+            stop.set()
+
+
+def _has_many_subdirs(directory: Path) -> bool:
+    """Return True if the directory has enough subfolders to walk in parallel."""
+    count = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    count += 1
+                    if count > PARALLEL_WALK_MIN_SUBDIRS:
+                        return True
+    except OSError:
+        pass
+    return False
+
+
+def _walk_mp3s(roots: Sequence[Path], cancel: threading.Event) -> Iterator[str]:
+    """Walk directories on the current thread, yielding MP3 paths as found."""
+    stack = [str(root) for root in roots]
+    while stack and not cancel.is_set():
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(_MP3_SUFFIXES) and entry.is_file():
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def _split_roots(items: Iterable[Path]) -> Tuple[List[Path], List[Path], List[str]]:
+    """
+    Sort selected paths into MP3 files and directories with one stat each.
+    Also return warnings for paths that will not be processed.
+    """
+    files: List[Path] = []
+    directories: List[Path] = []
     errors: List[str] = []
-    seen = set()
     for item in items:
-        if not item.exists():
+        try:
+            mode = os.stat(item).st_mode
+        except FileNotFoundError:
             errors.append(f"Missing path skipped: {item}")
             continue
-        if item.is_file():
-            if item.suffix.lower() == ".mp3":
-                if item not in seen:
-                    mp3s.append(item)
-                    seen.add(item)
+        except OSError as exc:
+            errors.append(f"Unreadable path skipped: {item} ({exc.strerror or exc})")
+            continue
+        if stat.S_ISREG(mode):
+            if item.name.endswith(_MP3_SUFFIXES):
+                files.append(item)
             else:
                 errors.append(f"Not an MP3 file skipped: {item}")
-            continue
-        # Directory walk
-        for mp3 in item.rglob("*.mp3"):
-            if mp3 not in seen:
-                mp3s.append(mp3)
-                seen.add(mp3)
-    return mp3s, errors
+        elif stat.S_ISDIR(mode):
+            directories.append(item)
+    return files, directories, errors
 
 
-def _ensure_easy_tags(file_path: Path) -> EasyID3:
-    """Return an EasyID3 instance, creating a tag header if missing."""
+def _iter_mp3s(
+    files: Sequence[Path], directories: Sequence[Path], cancel: threading.Event
+) -> Iterator[Path]:
+    """
+    Yield unique MP3 files, then those found under directories as discovered.
+    The walk ends early once cancel is set, even in folders without MP3s.
+    """
+    # Keyed on interned path strings; Path objects are only built for new hits.
+    seen: Set[str] = set()
+    for item in files:
+        key = sys.intern(str(item))
+        if key not in seen:
+            seen.add(key)
+            yield item
+
+    if any(_has_many_subdirs(d) for d in directories):
+        walked = _walk_mp3s_parallel(directories, cancel)
+    else:
+        walked = _walk_mp3s(directories, cancel)
+    for key in map(sys.intern, walked):
+        if key not in seen:
+            seen.add(key)
+            yield Path(key)
+
+
+def _load_id3(file_path: Path) -> ID3:
+    """Return the file's ID3 tag, or an empty one if the header is missing."""
     try:
-        audio = EasyID3(file_path)
+        return ID3(file_path)
     except ID3NoHeaderError:
-        audio = mutagen.File(file_path, easy=True)
-        if audio is None:
-            raise ValueError("Unsupported file; could not read tags")
-        audio.add_tags()
-        audio = EasyID3(file_path)
-    return audio
+        pass
+    # Only prepend a new header to files that really are MPEG audio.
+    try:
+        MP3(file_path)
+    except MutagenError as exc:
+        raise ValueError("Unsupported file; could not read tags") from exc
+    # The header is written by the caller's save(); no need to re-read.
+    return ID3()
+
+
+def _keep_padding(info: PaddingInfo) -> int:
+    """Reuse the existing padding so a tag that still fits is rewritten in place."""
+    if info.padding >= 0:
+        return info.padding
+    return info.get_default_padding()
 
 
 def _normalize_artist_entries(raw_artists: Iterable[str]) -> List[str]:
@@ -78,35 +258,259 @@ def _normalize_artist_entries(raw_artists: Iterable[str]) -> List[str]:
             continue
         # ID3 often stores multiple artists as separate entries, but some tools
         # join with "/" or ",". Split on common separators to restore the list.
-        for piece in str(raw).replace(";", ",").replace("/", ",").split(","):
+        for piece in _ARTIST_SPLIT.split(str(raw)):
             name = piece.strip()
             if name:
                 normalized.append(name)
     return normalized
 
 
-def _load_recent_dirs() -> List[Path]:
-    """Load up to 2 recent directories from disk."""
+def _apply_one(file_path: Path, genre: str, artists: List[str], join_artists: bool) -> None:
+    """Write the genre and artist tags to a single MP3 file."""
+    id3 = _load_id3(file_path)
+    if genre:
+        id3.setall("TCON", [TCON(encoding=3, text=[genre])])
+
+    # Choose artists to write: user-specified list, or normalized
+    # existing tags if none provided (helps split "aaa/bbb" into entries).
+    artists_to_write = artists
+    if not artists_to_write:
+        existing = [text for frame in id3.getall("TPE1") for text in frame.text]
+        artists_to_write = _normalize_artist_entries(existing)
+
+    if artists_to_write:
+        if join_artists:
+            artist_text = [" / ".join(artists_to_write)]
+        else:
+            artist_text = artists_to_write
+        id3.setall("TPE1", [TPE1(encoding=3, text=artist_text)])
+
+        # Also store canonical list for future processing; drop the old copy
+        # first to avoid duplicates.
+        id3.delall("TXXX:ARTISTS-LIST")
+        id3.add(TXXX(encoding=3, desc="ARTISTS-LIST", text=artists_to_write))
+    id3.save(file_path, padding=_keep_padding)
+
+
+def _open_cache() -> sqlite3.Connection:
+    """Open the applied-tags cache, falling back to memory if the file fails."""
+    conn: Optional[sqlite3.Connection] = None
     try:
-        data = json.loads(RECENT_PATH.read_text())
-        return [Path(p) for p in data if p]
-    except Exception:
-        return []
+        conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    except sqlite3.Error:
+        if conn is not None:
+            conn.close()
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS applied ("
+        "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+        "genre TEXT, artists TEXT, joined INTEGER)"
+    )
+    return conn
+
+
+def _cache_matches(
+    conn: sqlite3.Connection, key: str, st: os.stat_result, genre: str, artists_json: str, joined: bool
+) -> bool:
+    """Return True if the file is unchanged since these tags were last written."""
+    row = conn.execute(
+        "SELECT mtime_ns, size, genre, artists, joined FROM applied WHERE path = ?",
+        (key,),
+    ).fetchone()
+    return row == (st.st_mtime_ns, st.st_size, genre, artists_json, int(joined))
+
+
+def _cache_store(
+    conn: sqlite3.Connection, key: str, st: os.stat_result, genre: str, artists_json: str, joined: bool
+) -> None:
+    """Record the tags written to a file along with its post-save stat."""
+    conn.execute(
+        "INSERT OR REPLACE INTO applied VALUES (?, ?, ?, ?, ?, ?)",
+        (key, st.st_mtime_ns, st.st_size, genre, artists_json, int(joined)),
+    )
 
 
-def _save_recent_dirs(recent: List[Path]) -> None:
-    """Persist recent directories."""
+def _post_event(window: sg.Window, closed: threading.Event, key: str, value: object) -> None:
+    """Send an event from a worker thread; do nothing once the window is gone."""
+    if closed.is_set():
+        return
+    try:
+        window.write_event_value(key, value)
+    except Exception:
+        closed.set()  # Window was torn down underneath us; stop posting.
+
+
+def _run_tag_job(
+    window: sg.Window,
+    items: List[Path],
+    genre: str,
+    artists: List[str],
+    join_artists: bool,
+    cache: sqlite3.Connection,
+    cancel: threading.Event,
+    closed: threading.Event,
+) -> None:
+    """
+    Tag every MP3 under the selection on a background thread.
+    Log lines and the final count are sent back as window events.
+    """
+    found = 0
+    successes = 0
+    stopped = False
     try:
-        RECENT_PATH.write_text(json.dumps([str(p) for p in recent]))
+        files, directories, errors = _split_roots(items)
+        for err in errors:
+            _post_event(window, closed, "-LOG-LINE-", err)
+
+        artists_json = json.dumps(artists)
+        unchanged = 0
+        # The same file can be reached through symlinks or overlapping folders;
+        # writing it from two threads at once would corrupt it.
+        inodes: Set[Tuple[int, int]] = set()
+        in_flight: Dict[Future, Tuple[Path, str]] = {}
+
+        def finish(done: Iterable[Future]) -> None:
+            nonlocal successes
+            for future in done:
+                mp3, key = in_flight.pop(future)
+                if future.cancelled():
+                    continue
+                try:
+                    future.result()
+                except Exception as exc:  # noqa: BLE001
+                    _post_event(window, closed, "-LOG-LINE-", f"Failed: {mp3} ({exc})")
+                else:
+                    successes += 1
+                    _post_event(
+                        window,
+                        closed,
+                        "-LOG-LINE-",
+                        f"Updated: {mp3} "
+                        f"{'(genre)' if genre else ''}"
+                        f"{' (artist)' if artists else ''}",
+                    )
+                    try:
+                        _cache_store(cache, key, os.stat(key), genre, artists_json, join_artists)
+                    except (OSError, sqlite3.Error):
+                        pass
+
+        # One transaction per run so cache updates share a single commit.
+        with cache:
+            # Files are submitted while the walk is still running so tagging
+            # starts with the first hit; results and cache updates are handled
+            # on this thread between submissions.
+            with ThreadPoolExecutor(max_workers=TAG_WORKERS) as pool:
+                for mp3 in _iter_mp3s(files, directories, cancel):
+                    if cancel.is_set():
+                        break
+                    found += 1
+                    key = str(mp3.absolute())
+                    try:
+                        st = os.stat(key)
+                    except OSError:
+                        pass
+                    else:
+                        inode = (st.st_dev, st.st_ino)
+                        if inode in inodes:
+                            _post_event(
+                                window, closed, "-LOG-LINE-", f"Duplicate of an already selected file skipped: {mp3}"
+                            )
+                            continue
+                        inodes.add(inode)
+                        if _cache_matches(cache, key, st, genre, artists_json, join_artists):
+                            unchanged += 1
+                            continue
+                    # Block only when the in-flight set is full; otherwise just
+                    # pick up whatever has already finished.
+                    if in_flight:
+                        timeout = None if len(in_flight) >= MAX_IN_FLIGHT else 0
+                        done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                        finish(done)
+                    in_flight[pool.submit(_apply_one, mp3, genre, artists, join_artists)] = (mp3, key)
+                while in_flight:
+                    if cancel.is_set():
+                        # Drop files that have not started; in-flight saves finish.
+                        for future in in_flight:
+                            future.cancel()
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    finish(done)
+        if unchanged:
+            _post_event(
+                window, closed, "-LOG-LINE-", f"Skipped {unchanged} file(s) unchanged since the last run."
+            )
+        if cancel.is_set():
+            _post_event(window, closed, "-LOG-LINE-", "Cancelled.")
+    except Exception as exc:  # noqa: BLE001
+        # Report the failure instead of leaving the GUI stuck in "running".
+        stopped = True
+        _post_event(window, closed, "-LOG-LINE-", f"Tagging stopped: {exc}")
+    finally:
+        _post_event(window, closed, "-RUN-DONE-", (found, successes, stopped))
+
+
+def _load_recent_dirs() -> OrderedDict[Path, None]:
+    """Load up to RECENT_LIMIT recent directories from disk, newest first."""
+    global _last_saved_recent_json
+    try:
+        data = json.loads(RECENT_PATH.read_text())
+        recent = OrderedDict.fromkeys(Path(p) for p in data[:RECENT_LIMIT] if p)
     except Exception:
-        pass  # Swallow persistence errors; not critical.
+        return OrderedDict()
+    _last_saved_recent_json = json.dumps([str(p) for p in recent])
+    return recent
 
 
-def _remember_dir(current: List[Path], new_dir: Path) -> List[Path]:
-    """Insert a directory at the front of the MRU list, keeping max 2."""
-    resolved = new_dir.resolve()
-    updated = [resolved] + [p for p in current if p != resolved]
-    return updated[:2]
+def _write_recent_dirs() -> None:
+    """Background writer: atomically replace the recent-dirs file per request."""
+    while True:
+        path, payload = _recent_writes.get()
+        try:
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(payload)
+            os.replace(tmp_path, path)
+        except Exception:
+            pass  # Swallow persistence errors; not critical.
+        finally:
+            _recent_writes.task_done()
+
+
+def _save_recent_dirs(recent: OrderedDict[Path, None]) -> None:
+    """Persist recent directories in the background if they changed."""
+    global _last_saved_recent_json, _recent_writer
+    payload = json.dumps([str(p) for p in recent])
+    if payload == _last_saved_recent_json:
+        return
+    _last_saved_recent_json = payload
+    if _recent_writer is None:
+        _recent_writer = threading.Thread(target=_write_recent_dirs, daemon=True)
+        _recent_writer.start()
+    _recent_writes.put((RECENT_PATH, payload))
+
+
+@lru_cache(maxsize=256)
+def _resolve_cached(path_str: str) -> Path:
+    """Resolve a path once per session; repeat picks skip the realpath walk."""
+    return Path(path_str).resolve()
+
+
+def _remember_dir(recent: OrderedDict[Path, None], new_dir: Path) -> None:
+    """Move a directory to the front of the MRU dict, keeping RECENT_LIMIT."""
+    resolved = _resolve_cached(str(new_dir))
+    recent[resolved] = None
+    recent.move_to_end(resolved, last=False)
+    while len(recent) > RECENT_LIMIT:
+        recent.popitem(last=True)
+
+
+def _refresh_recent(window: sg.Window, recent: OrderedDict[Path, None]) -> None:
+    """Show the recent directories in the combo, selecting the newest."""
+    newest = next(iter(recent), None)
+    window["-RECENT-"].update(
+        values=[str(p) for p in recent],
+        value=str(newest) if newest is not None else "",
+    )
 
 
 def _parse_drop_value(value: str) -> List[str]:
@@ -116,18 +520,14 @@ def _parse_drop_value(value: str) -> List[str]:
     """
     if not value:
         return []
-    parts: List[str] = []
-    for chunk in value.replace(";", "\n").splitlines():
-        chunk = chunk.strip()
-        if chunk:
-            parts.append(chunk)
-    return parts
+    return [p for p in (s.strip() for s in _DROP_SPLIT.split(value)) if p]
 
 
 def main() -> None:
     sg.theme("SystemDefault")
 
     recent_dirs = _load_recent_dirs()
+    cache = _open_cache()
 
     layout = [
         [sg.Text("Genre to apply"), sg.Input(key="-GENRE-", size=(30, 1))],
@@ -183,6 +583,7 @@ def main() -> None:
         ],
         [
             sg.Button("Fill Genre", key="-RUN-", button_color=("white", "#4a7a44")),
+            sg.Button("Cancel", key="-CANCEL-", disabled=True),
             sg.Button("Exit"),
         ],
         [sg.Frame("Log", [[sg.Multiline(key="-LOG-", size=(70, 12), autoscroll=True, disabled=True, reroute_stdout=False, reroute_stderr=False)]])],
@@ -194,7 +595,15 @@ def main() -> None:
         finalize=True,
     )
 
-    selected: List[Path] = []
+    # Insertion-ordered dict doubles as an ordered set of selected paths.
+    selected: Dict[Path, None] = {}
+    # Listbox strings for selected, kept in the same order.
+    selected_display: List[str] = []
+    running = False
+    cancel = threading.Event()
+    # Set at exit so a running job stops posting events to the closed window.
+    closed = threading.Event()
+    job: Optional[threading.Thread] = None
 
     while True:
         event, values = window.read()
@@ -213,38 +622,44 @@ def main() -> None:
                     entries = list(chosen)
                 else:
                     entries = str(chosen).split(";")
-                selected.extend(_normalize_entries(entries))
+                _add_targets(selected, selected_display, _normalize_entries(entries))
+                _refresh_targets(window, selected_display)
         elif event == "-CHOOSE-FOLDER-":
             folder = sg.popup_get_folder("Select a folder")
             if folder:
-                selected.append(Path(folder))
-                recent_dirs = _remember_dir(recent_dirs, Path(folder))
+                _add_targets(selected, selected_display, [Path(folder)])
+                _refresh_targets(window, selected_display)
+                _remember_dir(recent_dirs, Path(folder))
                 _save_recent_dirs(recent_dirs)
-                window["-RECENT-"].update(values=[str(p) for p in recent_dirs], value=str(recent_dirs[0]))
+                _refresh_recent(window, recent_dirs)
         elif event == "-USE-RECENT-":
             recent_choice = values.get("-RECENT-")
             if recent_choice:
                 path_choice = Path(recent_choice)
-                selected.append(path_choice)
-                recent_dirs = _remember_dir(recent_dirs, path_choice)
+                _add_targets(selected, selected_display, [path_choice])
+                _refresh_targets(window, selected_display)
+                _remember_dir(recent_dirs, path_choice)
                 _save_recent_dirs(recent_dirs)
-                window["-RECENT-"].update(values=[str(p) for p in recent_dirs], value=str(recent_dirs[0]))
+                _refresh_recent(window, recent_dirs)
         elif event == "-CLEAR-":
-            selected = []
+            selected.clear()
+            selected_display.clear()
+            _refresh_targets(window, selected_display)
             _log_line(window, "Cleared selection.")
         elif event == "-DROP-":
             dropped = _parse_drop_value(values["-DROP-"])
             if dropped:
                 dropped_paths = _normalize_entries(dropped)
-                selected.extend(dropped_paths)
+                _add_targets(selected, selected_display, dropped_paths)
+                _refresh_targets(window, selected_display)
                 for p in dropped_paths:
                     if p.is_dir():
-                        recent_dirs = _remember_dir(recent_dirs, p)
+                        _remember_dir(recent_dirs, p)
                 _save_recent_dirs(recent_dirs)
                 if recent_dirs:
-                    window["-RECENT-"].update(values=[str(d) for d in recent_dirs], value=str(recent_dirs[0]))
+                    _refresh_recent(window, recent_dirs)
                 window["-DROP-"].update("")
-        elif event == "-RUN-":
+        elif event == "-RUN-" and not running:
             genre = values.get("-GENRE-", "").strip()
             artists_raw = values.get("-ARTIST-", "").strip()
             artists: List[str] = []
@@ -252,67 +667,55 @@ def main() -> None:
                 # Split on comma/semicolon into individual artist strings
                 artists = _normalize_artist_entries([artists_raw])
 
-            mp3s, errors = _collect_mp3s(selected)
-            for err in errors:
-                _log_line(window, err)
-            if not mp3s:
+            running = True
+            cancel.clear()
+            window["-RUN-"].update(disabled=True)
+            window["-CANCEL-"].update(disabled=False)
+            job = threading.Thread(
+                target=_run_tag_job,
+                args=(
+                    window,
+                    list(selected),
+                    genre,
+                    artists,
+                    bool(values.get("-JOIN-ARTISTS-", True)),
+                    cache,
+                    cancel,
+                    closed,
+                ),
+                daemon=True,
+            )
+            job.start()
+        elif event == "-CANCEL-":
+            cancel.set()
+            window["-CANCEL-"].update(disabled=True)
+        elif event == "-LOG-LINE-":
+            _log_line(window, values[event])
+        elif event == "-RUN-DONE-":
+            running = False
+            window["-RUN-"].update(disabled=False)
+            window["-CANCEL-"].update(disabled=True)
+            found, successes, stopped = values[event]
+            if stopped:
+                sg.popup_error(f"Tagging stopped early. Updated {successes} file(s); see the log.")
+            elif not found and not cancel.is_set():
                 sg.popup_error("No MP3 files found in the selection.")
-                continue
-
-            successes = 0
-            for mp3 in mp3s:
-                try:
-                    audio = _ensure_easy_tags(mp3)
-                    if genre:
-                        audio["genre"] = [genre]
-
-                    # Choose artists to write: user-specified list, or normalized
-                    # existing tags if none provided (helps split "aaa/bbb" into entries).
-                    artists_to_write = artists
-                    if not artists_to_write:
-                        existing = audio.get("artist", [])
-                        artists_to_write = _normalize_artist_entries(existing)
-
-                    if artists_to_write:
-                        join_artists = values.get("-JOIN-ARTISTS-", True)
-                        if join_artists:
-                            audio["artist"] = [" / ".join(artists_to_write)]
-                        else:
-                            audio["artist"] = artists_to_write
-
-                        # Also store canonical list for future processing.
-                        try:
-                            id3 = audio.tags
-                            # Remove old copy first to avoid duplicates.
-                            if "TXXX:ARTISTS-LIST" in id3:
-                                del id3["TXXX:ARTISTS-LIST"]
-                            id3.add(TXXX(encoding=3, desc="ARTISTS-LIST", text=artists_to_write))
-                        except Exception:
-                            pass
-                    audio.save()
-                except Exception as exc:  # noqa: BLE001
-                    _log_line(window, f"Failed: {mp3} ({exc})")
-                else:
-                    successes += 1
-                    _log_line(
-                        window,
-                        f"Updated: {mp3} "
-                        f"{'(genre)' if genre else ''}"
-                        f"{' (artist)' if artists else ''}",
-                    )
-            sg.popup_ok(f"Finished. Updated {successes} file(s).")
-
-        # Refresh listbox display with unique, readable paths
-        deduped = []
-        seen = set()
-        for item in selected:
-            if item not in seen:
-                deduped.append(item)
-                seen.add(item)
-        selected = deduped
-        window["-TARGETS-"].update(values=[str(p) for p in selected])
-
+            else:
+                sg.popup_ok(f"Finished. Updated {successes} file(s).")
+
+    if job is not None and job.is_alive():
+        # Stop the job and let its in-flight saves and cache commit finish
+        # before the window and the connection go away.
+        closed.set()
+        cancel.set()
+        while job.is_alive():
+            job.join(timeout=0.1)
+            if event != sg.WIN_CLOSED:
+                window.refresh()
     window.close()
+    # Let any queued recent-dir write land before the daemon writer is killed.
+    _recent_writes.join()
+    cache.close()
 
 
 if __name__ == "__main__":